@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import logging
 import os
+import re
 import sys
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from pprint import pprint
-from typing import Dict, List, Optional, TypedDict, Any
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple, TypedDict, Any
+import httpx
+import orjson
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain.chat_models import init_chat_model
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import interrupt
+
+from llm_cache import LLMCache, SimilarAnswerCache, is_similar, normalize_text
+from llm_pool import RequestPool, estimate_tokens
 
 parent_dir = os.path.abspath(os.path.join(os.getcwd(), os.pardir))
 sys.path.append(parent_dir)
@@ -19,8 +31,27 @@ load_dotenv(os.path.join(parent_dir, ".env"))
 
 
 def load_job_config(cfg_path: str) -> Dict[str, Any]:
-    with open(cfg_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    path = Path(cfg_path).resolve()
+    # callers mutate the dict, so each gets its own copy of the cached parse
+    return copy.deepcopy(_read_job_config(str(path), path.stat().st_mtime))
+
+
+@lru_cache(maxsize=8)
+def _read_job_config(cfg_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse the config file; keyed on mtime so edits on disk are picked up."""
+    return orjson.loads(Path(cfg_path).read_bytes())
+
+
+def _prepare_questions(questions: List[Dict]) -> List[Dict]:
+    """Precompute per-question data the evaluation loop would otherwise rebuild every turn."""
+    for q in questions:
+        q["_answer_template"] = {
+            "question_id": q["id"],
+            "question": q["text"],
+            "answer": "",
+            "notes": q.get("guidance", ""),
+        }
+    return questions
 
 
 @dataclass
@@ -38,20 +69,41 @@ class JobConfig:
 
 cfg_path = os.path.join(parent_dir, "interviewer_agent/data/job_config.json")
 
-# Load job description and interview questions
-config = load_job_config(cfg_path)
-
-config = JobConfig(
-    jd=config["job_description"],
-    questions=config["questions"],
-    q_idx=0,  # Start state
-    latest_answer=None,
-    pending_followups=[],
-    last_prompt=None,
-    answers=[],
-    no_followup_chances=int(config["number_of_followup_chances"]),
-    done=False
-)
+# Populated by load_config(); nothing is read from disk at import time.
+config: Optional[JobConfig] = None
+
+
+def load_config(path: Optional[str] = None) -> JobConfig:
+    """Load the job description and interview questions and make them the current config.
+
+    Cheap to call repeatedly (e.g. on every Streamlit rerun): the config is only
+    rebuilt when the file changes on disk.
+    """
+    global config
+    resolved = Path(path or os.getenv("JOB_DESCRIPTION_PATH") or cfg_path).resolve()
+    config = _build_job_config(str(resolved), resolved.stat().st_mtime)
+    return config
+
+
+@lru_cache(maxsize=8)
+def _build_job_config(cfg_path: str, mtime: float) -> JobConfig:
+    raw = copy.deepcopy(_read_job_config(cfg_path, mtime))
+    return JobConfig(
+        jd=raw["job_description"],
+        questions=_prepare_questions(raw["questions"]),
+        q_idx=0,  # Start state
+        latest_answer=None,
+        pending_followups=[],
+        last_prompt=None,
+        answers=[],
+        no_followup_chances=int(raw["number_of_followup_chances"]),
+        done=False
+    )
+
+
+def get_config() -> JobConfig:
+    """Return the current config, loading the default one on first use."""
+    return config if config is not None else load_config()
 
 
 class AgentState(TypedDict, total=False):
@@ -59,7 +111,8 @@ class AgentState(TypedDict, total=False):
     questions: List[Dict]
     q_idx: int
     latest_answer: Optional[str]
-    pending_followups: List[str]
+    pending_followups: Deque[str]
+    followups_seen: Set[str]
     last_prompt: Optional[str]
     answers: List[Dict]
     llm_responses: List[Dict]
@@ -68,6 +121,300 @@ class AgentState(TypedDict, total=False):
     review: str
 
 
+# The evaluator's instructions never change, so build the message once. Keeping
+# every invariant token here, ahead of the per-answer message, lets the provider
+# reuse its cached prompt prefix across turns and sessions.
+EVALUATOR_SYSTEM_PROMPT = """
+You are an expert hiring assistant evaluating candidate answers during an interview. Your task is to check whether the candidate’s answer demonstrates understanding of the topic. Understanding may be shown in two ways: 1. The answer explicitly contains the expected keywords. 2. The answer does not use the exact keywords but explains the concepts correctly and completely. Always evaluate based on meaning, not just exact wording. Return your result in the specified JSON structure and be kind with the user.
+
+For each message you receive an interview question, its expected keywords or concepts, and the candidate answer.
+
+Your task: 
+1. Identify whether the candidate’s answer contains each expected keyword. 
+2. If a keyword is missing but the candidate clearly explains the idea, mark it as "explained". 
+3. If neither the keyword nor the concept is present, mark it as "missing". 
+4. Give a short explanation for each classification. 
+5. If a keyword is missing make one follow-up question to clarify the missing keywords in "follow_up" 
+6. If the user does not understand the question, try to clarify and reformulate the question.
+7. If the user asks question about company data, do not provide the the data and reject the user's request respectfully.
+8. If the user provides any personal data (e.g age, gender, marital status, address etc.), do not store this data in the memory.
+9. Do not ask user any discriminative questions (e.g gender, nationality, color of skin etc.)
+10. If a question was answered previously, do not ask it again. 
+
+JSON format:
+{
+  "keywords": [
+    {
+      "keyword": "",
+      "status": "present | explained | missing",
+      "explanation": ""
+    }
+  ],
+  "overall_assessment": "",
+  "score": "",
+  "follow_up": ""
+}
+
+Return ONLY valid JSON.
+"""
+EVALUATOR_SYSTEM_MESSAGE = SystemMessage(content=EVALUATOR_SYSTEM_PROMPT)
+
+# Strict structured output: the evaluator reply always matches the shape the
+# follow-up logic reads, so parsing cannot fail on a malformed object.
+EVALUATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "answer_evaluation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "keyword": {"type": "string"},
+                            "status": {"type": "string", "enum": ["present", "explained", "missing"]},
+                            "explanation": {"type": "string"},
+                        },
+                        "required": ["keyword", "status", "explanation"],
+                        "additionalProperties": False,
+                    },
+                },
+                "overall_assessment": {"type": "string"},
+                "score": {"type": "string"},
+                "follow_up": {"type": "string"},
+            },
+            "required": ["keywords", "overall_assessment", "score", "follow_up"],
+            "additionalProperties": False,
+        },
+    },
+}
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+EVALUATOR_USER_PROMPT = """
+[Interview Question]
+{question}
+
+[Expected Keywords or Concepts]
+{required_keywords}
+
+[Candidate Answer]
+{latest}
+"""
+
+# Rubric + JD are identical for every per-question review call, so they form the
+# shared system-message prefix; only the question block differs.
+REVIEWER_SYSTEM_PROMPT = """
+You are an expert AI-engineering interviewer reviewing candidate answers.
+Evaluate the answers to ONE interview question based on:
+
+**1. Relevance to the question**
+**2. Technical correctness**
+**3. Alignment with the job description (JD)**
+**4. Presence of required keywords (from question metadata)**
+**5. Professionalism and clarity**
+**6. Depth of experience**
+**7. Signal vs noise (usefulness)**
+
+Return JSON with this structure:
+
+{{
+  "question_id": "",
+  "question": "",
+  "evaluation": "2–5 sentences",
+  "score": <number 0–10 based on relevance + technical depth + JD alignment>,
+  "keyword_coverage": {{"present": [], "missing": []}},
+  "strengths": [],
+  "weaknesses": [],
+  "risk_level": "Low | Medium | High"
+}}
+
+---------------------------
+### JOB DESCRIPTION:
+{jd}
+"""
+
+REVIEWER_QUESTION_PROMPT = """
+### QUESTION:
+{question_id}: {question}
+
+### REQUIRED KEYWORDS:
+{required_keywords}
+
+---------------------------
+### CANDIDATE ANSWERS (original answer followed by answers to follow-ups):
+{answers}
+---------------------------
+"""
+
+REPORTER_PROMPT = """
+You are an expert technical writer.  
+Your task is to convert the review data into a **clean, polished, executive-quality Markdown report**.
+
+The audience is:
+- Hiring managers
+- Senior AI/ML engineers
+- Talent acquisition specialists
+
+The tone should be:
+- Professional
+- Clear
+- Concise
+- Evidence-based
+
+---------------------------
+### REVIEW DATA TO SUMMARIZE:
+
+{review}
+
+---------------------------
+
+### MARKDOWN REPORT REQUIREMENTS
+
+Produce a Markdown document with the following structure:
+
+# Candidate Evaluation Report
+
+## 1. Executive Summary
+- One concise paragraph summarizing overall performance, strengths, and concerns.
+
+## 2. Job Description Alignment
+Summarize how well the candidate matches the JD requirements.
+
+## 3. Detailed Review by Question
+For each question:
+- **Question ID**
+- **Question Text**
+- **Score**
+- **Summary of evaluation**
+- **Keyword Coverage**
+- Bullet points highlighting strengths and weaknesses.
+
+## 4. Overall Assessment
+- Final score (0–10)
+- Hiring recommendation: **Strong Hire / Hire / Weak Hire / No Hire**
+
+## 5. Risks & Flags
+Bullet list of any major issues or concerns.
+
+Ensure the Markdown is clean and does not include unnecessary JSON dumps.
+"""
+
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def parse_llm_json(content: str) -> Dict[str, Any]:
+    """Parse a JSON object from an LLM reply, tolerating code fences or prose around it."""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        match = _JSON_OBJECT_RE.search(content)
+        if match is None:
+            raise
+        return orjson.loads(match.group(0))
+
+
+def _as_score(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_RISK_LEVELS = ("Low", "Medium", "High")
+
+
+def _overall_summary(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Roll the per-question strengths, weaknesses and risk up into one summary."""
+    def items(key: str) -> List[Any]:
+        return [v for r in reviews for v in (r.get(key) if isinstance(r.get(key), list) else [])]
+
+    risks = [r.get("risk_level") for r in reviews if r.get("risk_level") in _RISK_LEVELS]
+    return {
+        "strengths": items("strengths"),
+        "weaknesses": items("weaknesses"),
+        # the interview is as risky as its weakest answer
+        "hiring_risk_level": max(risks, key=_RISK_LEVELS.index) if risks else None,
+    }
+
+
+# Answers shorter than this are re-asked without an LLM call; answers longer than
+# COMPLETE_ANSWER_MIN_WORDS that name every keyword are accepted without one.
+MIN_ANSWER_WORDS = 3
+COMPLETE_ANSWER_MIN_WORDS = 5
+EMPTY_ANSWER_REASK = "I didn't catch an answer there. "
+SHORT_ANSWER_REASK = "Could you elaborate a bit more? "
+
+# Conservative formats only: emails, international phone numbers, US SSNs.
+# Emails need an alphabetic TLD and no trailing ":path" (package@1.2.3 and
+# git@host:repo are not addresses); phone numbers must stand alone.
+_PERSONAL_DATA_RE = re.compile(
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}(?![\w:/-])"
+    r"|(?P<phone>(?<![\w+])\+\d{1,3}[\s-]?(?:\(?\d{1,4}\)?[\s-]?){2,4}\d{2,4}(?![\w-]))"
+    r"|\b\d{3}-\d{2}-\d{4}\b"
+)
+# E.164 numbers carry at least this many digits; shorter "+20 30 40" runs are not phones
+MIN_PHONE_DIGITS = 8
+
+
+def _redact_match(match: re.Match) -> str:
+    if match.lastgroup == "phone" and sum(c.isdigit() for c in match.group()) < MIN_PHONE_DIGITS:
+        return match.group()
+    return "[redacted]"
+
+
+def redact_personal_data(text: str) -> str:
+    return _PERSONAL_DATA_RE.sub(_redact_match, text)
+
+
+@lru_cache(maxsize=256)
+def _keyword_patterns(keywords: Tuple[str, ...]) -> Tuple[re.Pattern, ...]:
+    """Compile one case-insensitive whole-word pattern per keyword, once per keyword list."""
+    return tuple(
+        re.compile(r"(?<!\w)" + re.escape(kw).replace(r"\ ", r"[\s\-/\\_]+") + r"(?!\w)", re.IGNORECASE)
+        for kw in keywords
+    )
+
+
+def mentions_all_keywords(answer: str, required_keywords: List[str]) -> bool:
+    """Whether every required keyword literally appears in the answer; stops at the first miss."""
+    return all(p.search(answer) for p in _keyword_patterns(tuple(required_keywords)))
+
+
+FOLLOW_UP_REPEAT_THRESHOLD = 0.9
+
+
+def _repeats_earlier_prompt(follow_up: str, seen: Set[str], questions: List[Dict]) -> bool:
+    """Whether a follow-up is (nearly) a question or follow-up the candidate already got."""
+    if follow_up in seen:
+        return True
+    norm = normalize_text(follow_up)
+    earlier = list(seen) + [q["text"] for q in questions]
+    return any(is_similar(norm, normalize_text(p), FOLLOW_UP_REPEAT_THRESHOLD) for p in earlier)
+
+
+def _local_evaluation(
+    required_keywords: List[str],
+    status: str,
+    assessment: str,
+    score: str = "",
+    follow_up: str = "",
+) -> Dict[str, Any]:
+    """Build an evaluation in the evaluator LLM's JSON shape without calling the LLM."""
+    return {
+        "keywords": [
+            {"keyword": kw, "status": status, "explanation": assessment}
+            for kw in required_keywords
+        ],
+        "overall_assessment": assessment,
+        "score": score,
+        "follow_up": follow_up,
+    }
+
+
 def initial_state_from_config(cfg: JobConfig) -> AgentState:
     """Create the initial LangGraph state from the loaded job configuration."""
     return AgentState(
@@ -75,7 +422,8 @@ def initial_state_from_config(cfg: JobConfig) -> AgentState:
         questions=cfg.questions,
         q_idx=0,
         latest_answer=None,
-        pending_followups=[],
+        pending_followups=deque(),
+        followups_seen=set(),
         last_prompt=None,
         answers=[],
         llm_responses=[],
@@ -83,15 +431,92 @@ def initial_state_from_config(cfg: JobConfig) -> AgentState:
         done=False,
     )
 
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """Run an async node from synchronous code (e.g. Streamlit) and return its result."""
+    global _loop
+    # Every Streamlit session runs in its own thread; funnel them all through one
+    # long-lived loop so its async HTTP connections stay open between turns.
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+logger = logging.getLogger(__name__)
+
+MAX_REVIEW_CONCURRENCY = 10
+
+# Shared by every session: identical prompts (replays, repeated answers) skip the LLM.
+llm_cache = LLMCache()
+answer_cache = SimilarAnswerCache(float(os.getenv("SIMILAR_ANSWER_THRESHOLD", "0.92")))
+# Every LLM call from every session is admitted through one RPM/TPM budget.
+request_pool = RequestPool.from_env()
+
+
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# httpx defaults to a 5s timeout; keep the openai client's 10 minutes for slow completions
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """Keep-alive HTTP/2 client shared by every chat model, so calls skip the TLS handshake."""
+    return httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+def _init_chat_model(model_name: str, http_async_client: Optional[httpx.AsyncClient] = None):
+    return init_chat_model(
+        model_name,
+        base_url=os.getenv("BASE_URL", ""),
+        api_key=os.getenv("API_KEY", "not-needed"),
+        http_client=_http_client(),
+        http_async_client=http_async_client,
+    )
+
+
+@lru_cache(maxsize=4)
+def get_chat_model(model_name: str):
+    """Return the process-wide chat model for synchronous calls so its connection pool is reused."""
+    return _init_chat_model(model_name)
+
+
+# Async connections belong to the loop that opened them, so each event loop gets
+# its own async client and the chat models bound to it.
+_loop_models: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, Dict[str, Any]]] = {}
+_loop_models_lock = threading.Lock()
+
+
+def get_async_chat_model(model_name: str):
+    """Return the chat model for the running event loop, reusing its keep-alive connections."""
+    loop = asyncio.get_running_loop()
+    with _loop_models_lock:
+        for closed in [l for l in _loop_models if l.is_closed()]:
+            del _loop_models[closed]
+        if loop not in _loop_models:
+            _loop_models[loop] = (httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT), {})
+        client, models = _loop_models[loop]
+        if model_name not in models:
+            models[model_name] = _init_chat_model(model_name, client)
+        return models[model_name]
+
+
 class Interviewer:
     """Encapsulates the ask/evaluate logic as class methods."""
 
     def __init__(self):
-        self.chat_model = init_chat_model(
-            os.getenv("MODEL_NAME", "gpt-4o-mini"),
-            base_url=os.getenv("BASE_URL", ""),
-            api_key=os.getenv("API_KEY", "not-needed"),
-        )
+        default_model = os.getenv("MODEL_NAME", "gpt-4o-mini")
+        # per-turn keyword classification can run on a smaller/cheaper model than
+        # the once-per-interview review and report
+        self.eval_model_name = os.getenv("EVAL_MODEL", default_model)
+        self.review_model_name = os.getenv("REVIEW_MODEL", default_model)
+        self.cache = llm_cache
+        self.answer_cache = answer_cache
+        self.pool = request_pool
 
     async def node_ask_question(self, state: AgentState, get_user_input=None) -> AgentState:
         if state.get("done"):
@@ -99,7 +524,7 @@ class Interviewer:
 
         # --- PRIORITIZE FOLLOW-UPS (unchanged) ---
         if state["pending_followups"]:
-            prompt = state["pending_followups"].pop(0)
+            prompt = state["pending_followups"].popleft()
         else:
             q_idx = state["q_idx"]
             if q_idx >= len(state["questions"]):
@@ -109,9 +534,8 @@ class Interviewer:
 
         # ---- FRONTEND INPUT INSTEAD OF CONSOLE INPUT ----
         if get_user_input is None:
-            # fallback: console-based
-            import asyncio
-            answer = await asyncio.to_thread(lambda: input("> "))
+            # pause the graph; the caller resumes it with Command(resume=answer)
+            answer = interrupt(prompt)
         else:
             # frontend-based
             answer = await get_user_input(prompt)
@@ -120,7 +544,47 @@ class Interviewer:
         state["last_prompt"] = prompt
         return state
 
-    def node_evaluate_answer(self, state: AgentState) -> AgentState:
+    async def _ainvoke(
+        self,
+        model_name: str,
+        messages: List[Any],
+        response_format: Optional[Dict] = None,
+        parse: Optional[Callable[[str], Any]] = None,
+    ) -> Any:
+        """Invoke the chat model, answering repeated identical requests from the cache.
+
+        With ``parse`` the parsed reply is returned, and a reply that fails to
+        parse is not cached, so retrying the same request asks the model again.
+        """
+        key = self.cache.cache_key(model_name, messages, response_format=response_format)
+        content = self.cache.get(key)
+        cached = content is not None
+        if not cached:
+            model = get_async_chat_model(model_name)
+            if response_format is not None:
+                # let the API enforce the JSON shape instead of hoping the prompt does
+                model = model.bind(response_format=response_format)
+            est_tokens = estimate_tokens(model_name, messages)
+            content = (await self.pool.submit(model.ainvoke, messages, est_tokens=est_tokens)).content
+        result = content if parse is None else parse(content)
+        if not cached:
+            self.cache.set(key, content)
+        return result
+
+    async def _evaluate_with_llm(self, question: str, required_keywords: List[str], latest: str) -> Dict[str, Any]:
+        """Ask the LLM to classify keyword coverage and propose a follow-up."""
+        # ----- LLM CALL -----------------------------------------------------------
+        # static instructions live in the system message; the answer goes last
+        user_prompt = EVALUATOR_USER_PROMPT.format(question=question,
+                                                   required_keywords=required_keywords,
+                                                   latest=latest)
+        
+        return await self._ainvoke(self.eval_model_name, [
+            EVALUATOR_SYSTEM_MESSAGE,
+            HumanMessage(content=user_prompt),
+        ], response_format=EVALUATION_RESPONSE_FORMAT, parse=parse_llm_json)
+
+    async def node_evaluate_answer(self, state: AgentState) -> AgentState:
         """Evaluate the latest answer, generate follow-ups, and advance the state."""
         if state.get("done"):
             return state
@@ -134,63 +598,55 @@ class Interviewer:
             state["done"] = True
             return state
     
-        latest = (state.get("latest_answer") or "").strip()
+        # personal data never reaches the LLM or the stored answers (prompt rule 8)
+        latest = redact_personal_data((state.get("latest_answer") or "").strip())
         q = questions[q_idx]
         question = q["text"]
         required_keywords = q.get("required_keywords", [])
     
-        # ----- LLM CALL -----------------------------------------------------------
-        system_prompt = """
-        You are an expert hiring assistant evaluating candidate answers during an interview. Your task is to check whether the candidate’s answer demonstrates understanding of the topic. Understanding may be shown in two ways: 1. The answer explicitly contains the expected keywords. 2. The answer does not use the exact keywords but explains the concepts correctly and completely. Always evaluate based on meaning, not just exact wording. Return your result in the specified JSON structure and be kind with the user.
-        Return ONLY valid JSON.
-        """
-    
-        user_prompt = """
-        [Interview Question]
-        {question}
-    
-        [Expected Keywords or Concepts]
-        {required_keywords}
-    
-        [Candidate Answer]
-        {latest}
-    
-        Your task: 
-        1. Identify whether the candidate’s answer contains each expected keyword. 
-        2. If a keyword is missing but the candidate clearly explains the idea, mark it as "explained". 
-        3. If neither the keyword nor the concept is present, mark it as "missing". 
-        4. Give a short explanation for each classification. 
-        5. If a keyword is missing make one follow-up question to clarify the missing keywords in "follow_up" 
-        6. If the user does not understand the question, try to clarify and reformulate the question.
-        7. If the user asks question about company data, do not provide the the data and reject the user's request respectfully.
-        8. If the user provides any personal data (e.g age, gender, marital status, address etc.), do not store this data in the memory.
-        9. Do not ask user any discriminative questions (e.g gender, nationality, color of skin etc.)
-        10. If a question was answered previously, do not ask it again. 
-        
-        JSON format:
-        {{
-          "keywords": [
-            {{
-              "keyword": "",
-              "status": "present | explained | missing",
-              "explanation": ""
-            }}
-          ],
-          "overall_assessment": "",
-          "score": "",
-          "follow_up": ""
-        }}
-        """
-
-        user_prompt = user_prompt.format(question = q["text"],
-                                         required_keywords=required_keywords,
-                                         latest=latest)
-        
-        llm_response = self.chat_model.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt),
-        ])
-        parsed = json.loads(llm_response.content)
+        # ---- FAST PATH: decide locally when the LLM cannot add anything -------
+        word_count = len(latest.split())
+        # re-ask what was actually shown; a terse reply to a follow-up can be complete
+        prompt = state.get("last_prompt") or question
+        for prefix in (EMPTY_ANSWER_REASK, SHORT_ANSWER_REASK):
+            prompt = prompt.removeprefix(prefix)  # don't stack re-ask prefixes
+        answering_follow_up = prompt != question
+        reasked = False  # local re-asks repeat the prompt on purpose
+        if not latest:
+            reasked = True
+            parsed = _local_evaluation(
+                required_keywords,
+                status="missing",
+                assessment="The candidate did not provide an answer.",
+                score="0",
+                follow_up=EMPTY_ANSWER_REASK + prompt,
+            )
+        elif word_count < MIN_ANSWER_WORDS and not answering_follow_up:
+            reasked = True
+            parsed = _local_evaluation(
+                required_keywords,
+                status="missing",
+                assessment="The answer is too short to evaluate.",
+                score="0",
+                follow_up=SHORT_ANSWER_REASK + prompt,
+            )
+        elif (
+            word_count > COMPLETE_ANSWER_MIN_WORDS
+            and required_keywords
+            and mentions_all_keywords(latest, required_keywords)
+        ):
+            parsed = _local_evaluation(
+                required_keywords,
+                status="present",
+                assessment="The answer explicitly mentions every expected keyword.",
+            )
+        else:
+            # the evaluation depends on the keywords too, which a config reload may change
+            cache_key = (question, tuple(required_keywords))
+            parsed = self.answer_cache.get(cache_key, latest)
+            if parsed is None:
+                parsed = await self._evaluate_with_llm(question, required_keywords, latest)
+                self.answer_cache.add(cache_key, latest, parsed)
     
         # ---- TRACK LLM RESPONSES -------------------------------------------------
         if "llm_responses" not in state:
@@ -205,19 +661,30 @@ class Interviewer:
             })
     
         q_track = state["llm_responses"][q_idx]
-        q_track["history"].append(parsed)
+        # keep only what later turns need; the full evaluation JSON would be
+        # re-serialized into every checkpoint for the rest of the interview
+        q_track["history"].append({
+            "score": parsed.get("score", ""),
+            "missing": [k["keyword"] for k in parsed.get("keywords", []) if k.get("status") == "missing"],
+            "follow_up": parsed.get("follow_up", ""),
+        })
     
         follow_up = parsed.get("follow_up", "").strip()
+        seen = state.setdefault("followups_seen", set())
+        if follow_up and not reasked and _repeats_earlier_prompt(follow_up, seen, questions[:q_idx + 1]):
+            # the model (nearly) repeated something already asked; treat the answer as final
+            follow_up = ""
     
         # ---- FOLLOW-UP LOGIC WITH LIMIT -------------------------------------
         if follow_up:  
-            if q_track["follow_up_count"] < config.no_followup_chances :
+            if q_track["follow_up_count"] < get_config().no_followup_chances :
                 q_track["follow_up_count"] += 1
+                seen.add(follow_up)
                 state["pending_followups"].append(follow_up)
             else:
                 # exceeded 3 follow-ups → move to next question
                 # print("⚠️ Maximum follow-ups reached. Moving to next question.")
-                state["pending_followups"] = []
+                state["pending_followups"].clear()
                 state["q_idx"] = q_idx + 1
         else:
             # answer was complete → move to next question
@@ -225,137 +692,97 @@ class Interviewer:
     
         # ---- SAVE USER ANSWER ----------------------------------------------------
         answers = state.get("answers", [])
-        answers.append({
-            "question_id": q["id"],
-            "question": q["text"],
-            "answer": latest,
-            "notes": q.get("guidance", "")
-        })
+        record = q["_answer_template"].copy()
+        record["answer"] = latest
+        answers.append(record)
         state["answers"] = answers
     
         # state["latest_answer"] = None
 
         return state
             
-    def node_reviewer(self, state: AgentState) -> AgentState:
-        reviewer_prompt = """
-                You are an expert AI-engineering interviewer reviewing candidate answers.
-                Evaluate all answers based on:
-                
-                **1. Relevance to the question**
-                **2. Technical correctness**
-                **3. Alignment with the job description (JD)**
-                **4. Presence of required keywords (from question metadata)**
-                **5. Professionalism and clarity**
-                **6. Depth of experience**
-                **7. Signal vs noise (usefulness)**
-                
-                ---------------------------
-                ### JOB DESCRIPTION:
-                {jd}
-                
-                ---------------------------
-                ### CANDIDATE ANSWERS:
-                Provide a structured review for **each answer** below.
-                
-                Format per answer:
-                - **Question ID**
-                - **Question Text**
-                - **Candidate Answer**
-                - **Evaluation** (2–5 sentences)
-                - **Score (0–10)** based on relevance + technical depth + JD alignment
-                - **Keyword Coverage**: list which required keywords (from question.required_keywords) are present or missing
-                
-                Finally produce:
-                
-                ### OVERALL SUMMARY
-                - Strengths
-                - Weaknesses
-                - Hiring Risk Level (Low/Medium/High)
-                - Final Overall Score (0–10)
-                
-                ---------------------------
-                ### DATA:
-                {answers}
-                ---------------------------
-                
-                Return JSON with this structure:
-                
-                {{
-                  "per_question_reviews": [...],
-                  "overall_summary": "...",
-                  "final_score": <number 0–10>
-                }}
-                """
-        reviewer_prompt = reviewer_prompt.format(jd=state["jd"], answers=state["answers"])
-        response = self.chat_model.invoke([HumanMessage(content=reviewer_prompt)])
-        state["review"] = response.content  # attach review to state
+    async def node_reviewer(self, state: AgentState) -> AgentState:
+        """Review every answered question concurrently and merge the results into one report."""
+        system_message = SystemMessage(content=REVIEWER_SYSTEM_PROMPT.format(jd=state["jd"]))
+        answers_by_question: Dict[str, List[Dict]] = {}
+        for record in state["answers"]:
+            answers_by_question.setdefault(record["question_id"], []).append(record)
+
+        # bound the fan-out so long interviews stay under the provider's rate limits
+        semaphore = asyncio.Semaphore(MAX_REVIEW_CONCURRENCY)
+
+        async def review_question(q: Dict) -> Dict[str, Any]:
+            prompt = REVIEWER_QUESTION_PROMPT.format(
+                question_id=q["id"],
+                question=q["text"],
+                required_keywords=q.get("required_keywords", []),
+                answers=[r["answer"] for r in answers_by_question[q["id"]]],
+            )
+            replies: List[str] = []
+
+            def parse(content: str) -> Dict[str, Any]:
+                replies.append(content)
+                parsed = parse_llm_json(content)
+                if not isinstance(parsed, dict):
+                    raise ValueError("review is not a JSON object")
+                return parsed
+
+            try:
+                async with semaphore:
+                    return await self._ainvoke(
+                        self.review_model_name,
+                        [system_message, HumanMessage(content=prompt)],
+                        response_format=JSON_OBJECT_FORMAT,
+                        parse=parse,
+                    )
+            except Exception as exc:
+                # one bad review must not sink the report; keep whatever the model said
+                logger.warning("Review of question %s failed: %s", q["id"], exc)
+                return {"question_id": q["id"], "raw": replies[-1] if replies else f"Review failed: {exc}"}
+
+        per_question_reviews = await asyncio.gather(*(
+            review_question(q) for q in state["questions"] if q["id"] in answers_by_question
+        ))
+        scores = [s for s in (_as_score(r.get("score")) for r in per_question_reviews) if s is not None]
+        review = {
+            "per_question_reviews": per_question_reviews,
+            "overall_summary": _overall_summary(per_question_reviews),
+            "final_score": round(sum(scores) / len(scores), 1) if scores else None,
+        }
+        state["review"] = orjson.dumps(review, option=orjson.OPT_INDENT_2).decode()  # attach review to state
 
         return state
 
-    def node_reporter(self, state: AgentState) -> AgentState:
-        reporter_prompt = """
-                    You are an expert technical writer.  
-                    Your task is to convert the review data into a **clean, polished, executive-quality Markdown report**.
-                    
-                    The audience is:
-                    - Hiring managers
-                    - Senior AI/ML engineers
-                    - Talent acquisition specialists
-                    
-                    The tone should be:
-                    - Professional
-                    - Clear
-                    - Concise
-                    - Evidence-based
-                    
-                    ---------------------------
-                    ### REVIEW DATA TO SUMMARIZE:
-                    
-                    {review}
-                    
-                    ---------------------------
-                    
-                    ### MARKDOWN REPORT REQUIREMENTS
-                    
-                    Produce a Markdown document with the following structure:
-                    
-                    # Candidate Evaluation Report
-                    
-                    ## 1. Executive Summary
-                    - One concise paragraph summarizing overall performance, strengths, and concerns.
-                    
-                    ## 2. Job Description Alignment
-                    Summarize how well the candidate matches the JD requirements.
-                    
-                    ## 3. Detailed Review by Question
-                    For each question:
-                    - **Question ID**
-                    - **Question Text**
-                    - **Score**
-                    - **Summary of evaluation**
-                    - **Keyword Coverage**
-                    - Bullet points highlighting strengths and weaknesses.
-                    
-                    ## 4. Overall Assessment
-                    - Final score (0–10)
-                    - Hiring recommendation: **Strong Hire / Hire / Weak Hire / No Hire**
-                    
-                    ## 5. Risks & Flags
-                    Bullet list of any major issues or concerns.
-                    
-                    Ensure the Markdown is clean and does not include unnecessary JSON dumps.
-                    """
-                            
-        reporter_prompt = reporter_prompt.format(review=state["review"])
-        response = self.chat_model.invoke([HumanMessage(content=reporter_prompt)])
-        state["report"] = response.content  # attach report to state
+    def _reporter_messages(self, state: AgentState) -> List[HumanMessage]:
+        return [HumanMessage(content=REPORTER_PROMPT.format(review=state["review"]))]
+
+    def _save_report(self, state: AgentState, report: str) -> None:
+        state["report"] = report  # attach report to state
         output_path = Path("report.md")
         output_path.write_text(state["report"], encoding="utf-8")
-        
-        print("******")
-        pprint(state["report"])
-        print("******")
+        logger.debug("Report generated (%d chars): %s", len(report), report)
+
+    def stream_report(self, state: AgentState) -> Iterator[str]:
+        """Yield the Markdown report as the model generates it, then attach it to the state."""
+        messages = self._reporter_messages(state)
+        # same key as _ainvoke, so the UI and the graph share cached reports
+        key = self.cache.cache_key(self.review_model_name, messages, response_format=None)
+        report = self.cache.get(key)
+        if report is None:
+            time.sleep(self.pool.reserve(estimate_tokens(self.review_model_name, messages)))
+            chunks = []
+            for chunk in get_chat_model(self.review_model_name).stream(messages):
+                chunks.append(chunk.content)
+                yield chunk.content
+            report = "".join(chunks)
+            self.cache.set(key, report)
+        else:
+            yield report
+        self._save_report(state, report)
+
+    async def node_reporter(self, state: AgentState) -> AgentState:
+        report = await self._ainvoke(self.review_model_name, self._reporter_messages(state))
+        self._save_report(state, report)
         return state
         
     def router(self, state: AgentState) -> str:
@@ -370,8 +797,9 @@ class Interviewer:
 
 
 # ---- Graph builder -------------------------------------------------------
-def build_graph() -> StateGraph:
-    """Create a LangGraph where the interview flow is driven entirely by the graph."""
+@lru_cache(maxsize=1)
+def _graph_builder() -> StateGraph:
+    """Declare the interview topology once; nodes share one stateless Interviewer."""
     interviewer = Interviewer()
 
     builder = StateGraph(AgentState)
@@ -400,12 +828,36 @@ def build_graph() -> StateGraph:
     builder.add_edge("ask", "evaluate")
     builder.add_edge("review", "report")
     builder.add_edge("report", END)
-    
-    memory = MemorySaver()
-    graph = builder.compile(checkpointer=memory)
+    return builder
+
+
+def build_graph(checkpoint: bool = True) -> StateGraph:
+    """Create a LangGraph where the interview flow is driven entirely by the graph.
+
+    Pass ``checkpoint=False`` to skip per-step state serialization when the
+    caller persists state itself; pausing in the ask node via ``interrupt``
+    requires the checkpointer.
+
+    The graph is compiled once per process and shared, together with its
+    ``MemorySaver``; keep sessions apart with a distinct ``thread_id`` in the run
+    config and call ``release_thread`` when a session ends.
+    """
+    # normalise the argument so build_graph() and build_graph(True) share one graph
+    return _compiled_graph(bool(checkpoint))
+
+
+@lru_cache(maxsize=2)
+def _compiled_graph(checkpoint: bool) -> StateGraph:
+    memory = MemorySaver() if checkpoint else None
+    graph = _graph_builder().compile(checkpointer=memory)
     return graph
 
 
+def release_thread(thread_id: str) -> None:
+    """Drop a finished session's checkpoints from the shared checkpointer."""
+    _compiled_graph(True).checkpointer.delete_thread(thread_id)
+
+
 def get_next_prompt(state: AgentState) -> Optional[str]:
     """
     Decide what to show next in the UI:
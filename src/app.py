@@ -3,15 +3,18 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from agents import (
-    config,
+    load_config,
     initial_state_from_config,
     Interviewer,
     get_next_prompt,
+    run_sync,
 )
 
 parent_dir = Path(__file__).resolve().parent.parent
 load_dotenv(parent_dir / ".env")
 
+config = load_config()
+
 st.set_page_config(page_title="Interview Agent", page_icon="🎤")
 st.title("🎤 Interviewer Assistant")
 st.markdown("Bot asks questions → you answer → it evaluates → follow-ups if needed → final report. 🚀")
@@ -19,6 +22,9 @@ st.markdown("Bot asks questions → you answer → it evaluates → follow-ups i
 
 def push(role: str, content: str):
     st.session_state.chat.append({"role": role, "content": content})
+    # render right away so a turn does not need a full rerun to show it
+    with st.chat_message(role):
+        st.markdown(content)
 
 
 def show_current_chat():
@@ -27,6 +33,23 @@ def show_current_chat():
             st.markdown(m["content"])
 
 
+@st.cache_resource
+def get_interviewer() -> Interviewer:
+    # stateless apart from the process-wide caches, so every session can share one
+    return Interviewer()
+
+
+def show_progress():
+    q_idx = st.session_state.state.get("q_idx", 0)
+    total = len(st.session_state.state.get("questions", []))
+    pending = len(st.session_state.state.get("pending_followups", []))
+    done = st.session_state.state.get("done", False)
+    with progress.container():
+        st.write(f"Question: {min(q_idx + 1, total)} / {total}")
+        st.write(f"Follow-ups queued: {pending}")
+        st.write(f"Done: {done}")
+
+
 def reset():
     st.session_state.state = dict(initial_state_from_config(config))
     st.session_state.chat = []
@@ -35,9 +58,6 @@ def reset():
     st.session_state.last_shown_prompt = None
 
 
-if "interviewer" not in st.session_state:
-    st.session_state.interviewer = Interviewer()
-
 if "state" not in st.session_state:
     st.session_state.state = dict(initial_state_from_config(config))
 
@@ -67,13 +87,7 @@ with st.sidebar:
         st.rerun()
 
     st.subheader("Progress")
-    q_idx = st.session_state.state.get("q_idx", 0)
-    total = len(st.session_state.state.get("questions", []))
-    pending = len(st.session_state.state.get("pending_followups", []))
-    done = st.session_state.state.get("done", False)
-    st.write(f"Question: {min(q_idx + 1, total)} / {total}")
-    st.write(f"Follow-ups queued: {pending}")
-    st.write(f"Done: {done}")
+    progress = st.empty()
 
     # support button
     st.divider()
@@ -88,6 +102,7 @@ with st.sidebar:
     st.caption("Built for internal HR policy demos with with Streamlit · Powered by OpenAI ✨")
 
 
+show_progress()
 show_current_chat()
 
 if not st.session_state.started:
@@ -98,7 +113,7 @@ if not st.session_state.started:
         if prompt:
             # If it's a follow-up, pop it when we display it
             if st.session_state.state.get("pending_followups"):
-                st.session_state.state["pending_followups"].pop(0)
+                st.session_state.state["pending_followups"].popleft()
 
             st.session_state.last_shown_prompt = prompt
             push("assistant", prompt)
@@ -106,14 +121,19 @@ if not st.session_state.started:
         st.rerun()
     st.stop()
 
+interviewer = get_interviewer()
 state = st.session_state.state
 
 if state.get("done") and not st.session_state.report_ready:
-    with st.spinner("Generating final review and report..."):
-        state = st.session_state.interviewer.node_reviewer(state)
-        state = st.session_state.interviewer.node_reporter(state)
+    with st.spinner("Generating final review..."):
+        state = run_sync(interviewer.node_reviewer(state))
         st.session_state.state = state
 
+    # render the report while it is being written instead of after the last token
+    st.divider()
+    st.subheader("📄 Candidate Evaluation Report")
+    st.write_stream(interviewer.stream_report(state))
+
     st.session_state.report_ready = True
     push("assistant", "✅ Interview complete. I generated your report below.")
     st.rerun()
@@ -154,8 +174,8 @@ if user_text:
 
     # 3) evaluate
     with st.spinner("Evaluating..."):
-        st.session_state.state = st.session_state.interviewer.node_evaluate_answer(
-            st.session_state.state
+        st.session_state.state = run_sync(
+            interviewer.node_evaluate_answer(st.session_state.state)
         )
 
     # 4) compute next prompt (follow-up or next question)
@@ -170,9 +190,8 @@ if user_text:
     # If it is a follow-up prompt, pop it *now* since we are about to show it.
     if st.session_state.state.get("pending_followups"):
         # get_next_prompt returns pending_followups[0] when present
-        st.session_state.state["pending_followups"].pop(0)
+        st.session_state.state["pending_followups"].popleft()
 
     st.session_state.last_shown_prompt = next_prompt
     push("assistant", next_prompt)
-
-    st.rerun()
+    show_progress()
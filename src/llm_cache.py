@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import orjson
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and drop punctuation/extra whitespace so trivial rewordings compare equal."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def is_similar(a: str, b: str, threshold: float) -> bool:
+    """Whether two normalized texts reach the difflib similarity threshold."""
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # cheap upper bounds first; ratio() is quadratic in the worst case
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
+class LLMCache:
+    """In-memory exact-match cache mapping an LLM request to its response text."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(model: str, messages: Sequence[Any], **params: Any) -> str:
+        """Hash the model name, message contents and call parameters into a stable key."""
+        payload = {
+            "model": model,
+            "messages": [[m.type, m.content] for m in messages],
+            "params": params,
+        }
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[0] > self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class SimilarAnswerCache:
+    """Reuse the evaluation of an earlier answer to the same question when a new one nearly matches it.
+
+    ``key`` identifies what the evaluation depends on besides the answer (the
+    question and its required keywords), so editing either starts afresh.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_per_question: int = 64, ttl: Optional[float] = 3600.0):
+        self.threshold = threshold
+        self.max_per_question = max_per_question
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._answers: Dict[Hashable, List[Tuple[float, str, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, answer: str) -> Optional[Dict[str, Any]]:
+        norm = normalize_text(answer)
+        with self._lock:
+            entries = self._answers.get(key, [])
+            if self.ttl is not None:
+                cutoff = time.monotonic() - self.ttl
+                # entries are appended in time order, so expired ones form a prefix
+                while entries and entries[0][0] < cutoff:
+                    del entries[0]
+            for _, prior, evaluation in reversed(entries):
+                if is_similar(norm, prior, self.threshold):
+                    self.hits += 1
+                    return copy.deepcopy(evaluation)
+            self.misses += 1
+            return None
+
+    def add(self, key: Hashable, answer: str, evaluation: Dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._answers.setdefault(key, [])
+            entries.append((time.monotonic(), normalize_text(answer), copy.deepcopy(evaluation)))
+            del entries[:-self.max_per_question]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Sequence
+
+import tiktoken
+from openai import RateLimitError
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """Return the model's tokenizer, or None when its BPE file cannot be loaded (e.g. offline)."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken downloads encodings on first use; throttling must not depend on that
+        return None
+
+
+def estimate_tokens(model: str, messages: Sequence[Any]) -> int:
+    """Count the prompt tokens of a message list, as the provider's TPM limit would."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return sum(len(m.content) // 4 for m in messages)
+    return sum(len(encoding.encode(m.content)) for m in messages)
+
+
+class _TokenBucket:
+    """Per-minute budget refilled continuously; may go negative to queue reservations."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def take(self, amount: float, now: float) -> float:
+        """Consume ``amount`` and return the seconds until the budget covers it."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+
+class RequestPool:
+    """Process-wide throttle for LLM calls from every session: RPM/TPM buckets plus backoff."""
+
+    def __init__(self, max_rpm: float, max_tpm: float, max_attempts: int = 5):
+        self.max_attempts = max_attempts
+        self._requests = _TokenBucket(max_rpm)
+        self._tokens = _TokenBucket(max_tpm)
+        # sessions run on different threads (and event loops), so guard with a plain lock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestPool":
+        return cls(
+            max_rpm=float(os.getenv("MAX_REQUESTS_PER_MINUTE", "500")),
+            max_tpm=float(os.getenv("MAX_TOKENS_PER_MINUTE", "200000")),
+            max_attempts=int(os.getenv("MAX_ATTEMPTS", "5")),
+        )
+
+    def reserve(self, est_tokens: int) -> float:
+        """Claim capacity for one request and return how long to wait before sending it."""
+        with self._lock:
+            now = time.monotonic()
+            return max(self._requests.take(1, now), self._tokens.take(est_tokens, now))
+
+    async def submit(self, fn: Callable[..., Awaitable[Any]], *args: Any, est_tokens: int, **kwargs: Any) -> Any:
+        """Await ``fn(*args, **kwargs)`` once the budget allows it, retrying on rate limits."""
+        for attempt in range(1, self.max_attempts + 1):
+            delay = self.reserve(est_tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                return await fn(*args, **kwargs)
+            except RateLimitError:
+                if attempt == self.max_attempts:
+                    raise
+                await asyncio.sleep(2 ** attempt + random.random())